@@ -12,4 +12,8 @@ setup(name='data_distiller',
       package_dir={"": "src"},
       packages=find_packages(where="src"),
       python_requires=">=3.6",
-      install_requires=["liboptions >= 0.9.0"])
+      install_requires=["liboptions >= 0.9.0"],
+      extras_require={"numba": ["numba"],
+                      "arrow": ["pyarrow"],
+                      "uring": ["liburing >= 2026.3.30; "
+                                "sys_platform == 'linux'"]})
@@ -1,8 +1,11 @@
 
+from data_distiller.distillernode import STOP
 from data_distiller.distillery import Distillery, PrinterProcess
 from data_distiller.sampling_processes import (Sample2Text,
                                                Sample2ObjectList,
                                                Sample2Table,
+                                               Sample2Arrow,
+                                               Sample2Parquet,
                                                Sample2XSV,
                                                Sample2SQLite)
 from data_distiller.text_distilling_processes import (PrintText,
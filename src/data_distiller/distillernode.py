@@ -27,8 +27,79 @@ passed to the next DistillerNode (if any exists).
     node.add_node(next_node)
 
     node.distill_node(input)
+
+If numba is installed and every process of a node exposes a 'kernel'
+attribute (a numba.njit function that receives and returns the node
+input) then 'fuse_kernels' compiles all kernels into a single function
+that replaces the per-process dispatch loop for that node, if every
+node of a chain is fused then 'fuse_chain' compiles the whole chain.
 """
 
+# Processes may return STOP instead of 'None' to interrupt the processing,
+# both are treated the same way (the node output will be 'None'). Unlike
+# 'None', STOP is never confused with a falsy but valid output.
+STOP = object()
+
+def _import_numba():
+    """Returns the numba module, or 'None' if it is not installed.
+
+    numba is slow to import, so it is only imported once a node that
+    can be fused (see 'DistillerNode.fuse_kernels') is found.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba
+
+
+def _fuse_kernels(kernels, opt_nums):
+    """Compiles a chain of numba kernels into a single function.
+
+    Args:
+        kernels: List of numba.njit functions.
+        opt_nums: Number of times each kernel should be executed.
+
+    Returns:
+        A numba.njit function equivalent to calling every kernel in
+        sequence, each output being the input of the next kernel.
+    """
+    namespace = dict()
+    source = ["def _fused(x):"]
+    for index, (kernel, opt_num) in enumerate(zip(kernels, opt_nums)):
+        namespace["k" + str(index)] = kernel
+        source.extend(["    x = k" + str(index) + "(x)"] * opt_num)
+    source.append("    return x")
+
+    exec("\n".join(source), namespace)  # pylint: disable=exec-used
+    return _import_numba().njit(namespace["_fused"])
+
+
+def fuse_chain(nodes):
+    """Compiles the kernels of a whole chain of nodes into one function.
+
+    Args:
+        nodes: List of DistillerNodes, in processing order.
+
+    Returns:
+        A numba.njit function equivalent to distilling an input through
+        every node, or 'None' if any node could not be fused (see
+        'DistillerNode.fuse_kernels').
+    """
+    kernels = []
+    opt_nums = []
+    for node in nodes:
+        if node._fused is None:
+            return None
+        for process, opt_num, *_ in node.node_process_list:
+            kernels.append(process.kernel)
+            opt_nums.append(opt_num)
+
+    if not kernels:
+        return None
+    return _fuse_kernels(kernels, opt_nums)
+
+
 class DistillerNode:
     """Class that represents a single node of a distilling process.
 
@@ -41,9 +112,18 @@ class DistillerNode:
     Attributes:
         node_process_list: List of tuples data processing objects and
             a sampling flag.
+        sampling_process: Sampling process object (or 'None').
         next_node: 'Pointer' to the next DistillerNode in the data
             processing chain.
     """
+    __slots__ = ("node_process_list",
+                 "sampling_process",
+                 "next_node",
+                 "exec_count",
+                 "_steps",
+                 "_store_samples",
+                 "_fused")
+
     def __init__(self):
         """Initializes the DistillerNode object with an empty
         configuration
@@ -52,6 +132,13 @@ class DistillerNode:
         self.sampling_process = None
         self.next_node = None
 
+        # One (distill, opt_num, limited, sample_active, is_single) tuple
+        # per process, with the bound 'distill' method resolved once and
+        # 'sample_active' set only if a sampling process is registered.
+        self._steps = []
+        self._store_samples = None
+        self._fused = None
+
         self.exec_count = 0
 
     def add_process(self, process, opt_num, limited, sample_flag):
@@ -71,6 +158,8 @@ class DistillerNode:
         node_process_tuple = (process, opt_num, limited, sample_flag)
         self.node_process_list.append(node_process_tuple)
 
+        self._steps.append(self._step(node_process_tuple))
+
     def add_sampling_process(self, sampling_process):
         """Stores sampling process
 
@@ -78,6 +167,15 @@ class DistillerNode:
             sampling_process: Instance of a sampling process object.
         """
         self.sampling_process = sampling_process
+        self._steps = [self._step(node_process_tuple)
+                       for node_process_tuple in self.node_process_list]
+        self._store_samples = getattr(sampling_process, "store_samples", None)
+
+    def _step(self, node_process_tuple):
+        """Returns the '_steps' tuple of a 'node_process_list' tuple."""
+        process, opt_num, limited, sample_flag = node_process_tuple
+        sample_active = bool(sample_flag and self.sampling_process)
+        return (process.distill, opt_num, limited, sample_active, opt_num == 1)
 
     def add_node(self, node):
         """Store the 'pointer' for the next node
@@ -87,6 +185,50 @@ class DistillerNode:
         """
         self.next_node = node
 
+    def _flush_samples(self, sample_buf):
+        """Passes the samples of a single node call to the sampling process.
+
+        The whole list is passed at once if it has more than one sample
+        and the sampling process has the optional 'store_samples'
+        method, otherwise each sample is passed to 'store_sample'.
+
+        Args:
+            sample_buf: List of samples, in the order they were created.
+        """
+        if self._store_samples is not None and len(sample_buf) > 1:
+            self._store_samples(sample_buf)
+        else:
+            store = self.sampling_process.store_sample
+            for samples in sample_buf:
+                store(samples)
+
+    def fuse_kernels(self):
+        """Compiles this node's processes into a single function.
+
+        The processes are only fused if numba is available, all of them
+        expose a 'kernel' attribute, none of them is sampled and none of
+        them has a limited number of executions. Otherwise this node
+        keeps using the regular 'distill' dispatch.
+
+        Returns:
+            True if the processes were fused.
+        """
+        self._fused = None
+        if not self.node_process_list:
+            return False
+
+        for process, _, limited, sample_flag in self.node_process_list:
+            if not hasattr(process, "kernel") or limited or sample_flag:
+                return False
+
+        if _import_numba() is None:
+            return False
+
+        kernels = [process.kernel for process, *_ in self.node_process_list]
+        opt_nums = [opt_num for _, opt_num, *_ in self.node_process_list]
+        self._fused = _fuse_kernels(kernels, opt_nums)
+        return True
+
     def print_node(self):
         """Prints a visual representation of this node's processes.
 
@@ -98,13 +240,8 @@ class DistillerNode:
         print("   |")
         print("   V")
         if self.node_process_list:
-            process, *opt = self.node_process_list[0]
-            del opt
-            str2print = process.name
-            for process, *opt in range(1, len(self.node_process_list)):
-                str2print += " > " + process.name
-
-            print(str2print)
+            print(" > ".join(process.name
+                             for process, *_ in self.node_process_list))
 
         if self.next_node:
             self.next_node.print_node()
@@ -139,36 +276,81 @@ class DistillerNode:
             The output from the last executed process, this varies with
             the input type and processes being used, if the processing
             is done in batches then typically the output should be what
-            will be used as input in the next batch. If 'None' is
-            returned by any process then the processing is interrupted
-            and the output will also be 'None'.
+            will be used as input in the next batch. If 'None' (or
+            'STOP') is returned by any process then the processing is
+            interrupted and the output will be 'None'.
         """
-        node_output = None
-        if self.node_process_list:
-            for process, opt_num, limited, sample_flag in self.node_process_list:
+        node_output = self._distill_local(node_input)
+        node = self.next_node
+        while node is not None and node_output is not None:
+            node_output = node._distill_local(node_output)
+            node = node.next_node
 
-                exec_count_reached = self.exec_count >= opt_num
+        return node_output
 
-                if (node_input is None) or (limited and exec_count_reached):
-                    break
+    def _distill_local(self, node_input):
+        """Executes the distill method of this node's processes only.
 
-                for i in range(0, opt_num):
-                    del i
-                    node_input, samples = process.distill(node_input)
+        Same as 'distill_node' but the 'next_node' (if any exists) is
+        not called, this allows a Distillery to iterate over a flat
+        list of nodes instead of recursing through the whole chain.
 
-                    if sample_flag and samples and self.sampling_process:
-                        self.sampling_process.store_sample(samples)
+        Args:
+            node_input: Data source that should be compatible with the
+                registered processes.
 
-                    if node_input is None:
-                        break
+        Returns:
+            The output from the last executed process of this node.
+        """
+        steps = self._steps
+        if not steps or node_input is None or node_input is STOP:
+            return None
 
+        if self._fused is not None:
             self.exec_count += 1
+            return self._fused(node_input)
+
+        exec_count = self.exec_count
+        sample_buf = None  # Only allocated once a sample is produced.
+
+        for distill, opt_num, limited, sample_active, is_single in steps:
+            exec_count_reached = exec_count >= opt_num
+
+            if limited and exec_count_reached:
+                break
 
-            if node_input and self.next_node:
-                node_output = self.next_node.distill_node(node_input)
-            elif limited and exec_count_reached and self.next_node is None:
-                node_output = None
+            if is_single:
+                node_input, samples = distill(node_input)
+
+                if sample_active and samples:
+                    if sample_buf is None:
+                        sample_buf = [samples]
+                    else:
+                        sample_buf.append(samples)
             else:
-                node_output = node_input
+                count = 0
+                while count < opt_num:
+                    count += 1
+                    node_input, samples = distill(node_input)
+
+                    if sample_active and samples:
+                        if sample_buf is None:
+                            sample_buf = [samples]
+                        else:
+                            sample_buf.append(samples)
+
+                    if node_input is None or node_input is STOP:
+                        break
 
-        return node_output
+            if node_input is None or node_input is STOP:
+                node_input = None
+                break
+
+        self.exec_count = exec_count + 1
+
+        if sample_buf is not None:
+            self._flush_samples(sample_buf)
+
+        if limited and exec_count_reached and self.next_node is None:
+            return None
+        return node_input
@@ -37,11 +37,118 @@ been previously registered).
 """
 
 
+import collections
 import copy as cp
-
-from .distillernode import DistillerNode
+import functools
+import hashlib
+import os
+import pickle
+import queue
+import re
+import sys
+import threading
+from types import MappingProxyType
+
+from .distillernode import DistillerNode, fuse_chain
 from liboptions import opt_generator
 
+
+# Process configuration, e.g. "2rsPROCESS(opt=value)": repetition number,
+# execution options, process name and process options.
+_CFG_PATTERN = r"^(\d*)([{exec_tokens}]*)([A-Z]\w*)(?:{start}(.*){end})?\s*$"
+
+
+def _node_opt_sanity_check(node_opt, repeat_token, once_token, sampling_token):
+    repeat_count = node_opt.count(repeat_token)
+    once_count = node_opt.count(once_token)
+    sample_count = node_opt.count(sampling_token)
+
+    node_cfg_ok = True
+    if repeat_count > 1:
+        node_cfg_ok = False
+    if once_count > 1:
+        node_cfg_ok = False
+    if sample_count > 1:
+        node_cfg_ok = False
+    if (repeat_count != 1) and (once_count != 1):
+        node_cfg_ok = False
+
+    return node_cfg_ok
+
+
+@functools.lru_cache(maxsize=None)
+def _cfg_regex(exec_tokens, opt_start_token, opt_end_token):
+    return re.compile(_CFG_PATTERN.format(exec_tokens=re.escape(exec_tokens),
+                                          start=re.escape(opt_start_token),
+                                          end=re.escape(opt_end_token)))
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_proc_cfg(proc_cfg, cfg_tokens):
+    """Parses the configuration of a single process.
+
+    Configuration files usually repeat the same process configurations
+    many times, so results are cached.
+
+    Args:
+        proc_cfg(str): Configuration of a single process.
+        cfg_tokens(tuple): Repeat execution, once execution, sampling,
+            options start and options end tokens.
+
+    Returns:
+        A tuple with the process repetition number, the 'limited' and
+        'sample_flag' flags, the process name and a tuple of the
+        (name, value) process options, or 'None' if no options exist.
+
+    Raises:
+        ValueError: Invalid process configuration.
+    """
+    repeat_token, once_token, sampling_token, start_token, end_token = \
+        cfg_tokens
+
+    cfg_re = _cfg_regex(repeat_token + once_token + sampling_token,
+                        start_token,
+                        end_token)
+    match = cfg_re.match(proc_cfg.strip())
+    if match is None:
+        raise ValueError("Invalid node configuration: " + proc_cfg)
+
+    opt_num_str, exec_opt, proc_name, process_opt = match.groups()
+
+    if not _node_opt_sanity_check(exec_opt,
+                                  repeat_token,
+                                  once_token,
+                                  sampling_token):
+        raise ValueError("Invalid node configuration: " + proc_cfg)
+
+    opt_num = 1 # If no number is given then 1 is assumed.
+    if opt_num_str:
+        opt_num = int(opt_num_str)
+
+    limited = repeat_token not in exec_opt  # 'r' has priority.
+    sample_flag = sampling_token in exec_opt
+
+    opt_pairs = None
+    if process_opt:
+        opt_pairs = tuple(opt_generator(process_opt))
+
+    return opt_num, limited, sample_flag, proc_name, opt_pairs
+
+_CACHE_SUFFIX = ".cache.pkl"
+
+# Parsed configuration of a single process of a node: the registered
+# process object, its execution options and its (optional) process options.
+NodeSpec = collections.namedtuple("NodeSpec", ["process",
+                                               "opt_num",
+                                               "limited",
+                                               "sample_flag",
+                                               "opt_dict"])
+
+# Marks the end of the inputs of a 'Distillery.stream' call.
+_STREAM_END = object()
+# Maximum number of inputs waiting between two nodes of a stream.
+_STREAM_QUEUE_SIZE = 16
+
 class Distillery:
     """Class that represents a 'distillery' data processing structure.
 
@@ -67,13 +174,23 @@ class Distillery:
     sample of the processed data (alternatively 'None' is expected).
     If a data processing object is configurable then it must also
     contain a 'config_process' method that receives a list of str
-    containing its options.
+    containing its options. Each configured use of a process receives
+    its own copy of the registered object, made by its optional 'clone'
+    method (which should return an equivalent, independent object) or
+    by 'copy.deepcopy' if no 'clone' method exists. Processes may also
+    expose a 'kernel' attribute, a numba.njit function that receives
+    the process input and returns its output, nodes made only of such
+    processes are compiled into a single function (see
+    'DistillerNode.fuse_kernels'), if all nodes are fused then the
+    whole chain is compiled into a single function.
 
     Sampling processes are a somewhat generic form of storing,
     printing and/or logging the results of data processing objects.
     Sampling and data processing objects should be compatible as the
     sample data from the data processing objects is the input for the
-    sampling process 'store_sample' method.
+    sampling process 'store_sample' method. A distillery can be used as
+    a context manager, the sampling process is closed on exit (see
+    'close').
 
     Attributes:
         next (bool): Indicates wheter another iteration of the
@@ -81,7 +198,8 @@ class Distillery:
         nodes (:obj:`list` of :obj: 'DistillerNode'): List of
             DistillerNode objects.
         process_registry(:obj:'dict' of :obj: ?): Dictionary mapping
-            a process name to an instance of that process.
+            a process name to an instance of that process, it becomes
+            a read-only mapping once 'config_distillery' is called.
         samplig_process(:obj: ?): Sampling process object.
         comment_token(str): Token that identifies that a line in the
             configuration file is a comment.
@@ -102,7 +220,10 @@ class Distillery:
         """
         self.next = False
         self.nodes = []
+        self._flat_nodes = []
+        self._fused_chain = None
         self.process_registry = dict()
+        self._registry_tuple = dict()
         self.sampling_process = None
 
         self.comment_token = "#"
@@ -128,8 +249,12 @@ class Distillery:
 
         Raises:
 
-            ValueError: Duplicate name in process registry.
+            ValueError: Duplicate name in process registry or the
+                registry is already frozen by 'config_distillery'.
         """
+        if isinstance(self.process_registry, MappingProxyType):
+            raise ValueError("Processes can not be registered after "
+                             "config_distillery is called")
         if process_name in self.process_registry:
             raise ValueError("The process registry already has a '" +
                              process_name + "' process")
@@ -144,7 +269,7 @@ class Distillery:
         """
         self.sampling_process = sampling_process
 
-    def config_distillery(self, config):
+    def config_distillery(self, config, use_cache=False):
         """Creates and configures data processing structure
 
         Creates a PrimeNode object that will process a configuration list
@@ -154,33 +279,175 @@ class Distillery:
         'reset_distillery' method is called so that the Distillery object
         state is set to be ready to start processing data.
 
+        If 'use_cache' is set and 'config' is a file name then the
+        resulting nodes are stored in a '<config>.cache.pkl' sidecar
+        file, later calls load the nodes from it for as long as the
+        configuration file, the registered process names and the
+        configuration tokens remain unchanged.
+
         Args:
             config(obj): Either a String containing the configuration file
                 name or a list of strings.
+            use_cache(bool): Indicates wheter the configuration file
+                cache should be used.
         """
+        self._freeze_registry()
+
+        nodes = None
         if isinstance(config, str):
-            file = open(config,"r")
-            config_list = file.readlines()
-            file.close()
+            if use_cache:
+                cache_key = self._cache_key(config)
+                nodes = self._load_cached_nodes(config, cache_key)
+
+            if nodes is None:
+                config_list = self._read_config_file(config)
         elif isinstance(config, list):
             config_list = config
         else:
             raise ValueError(("The config_distillery method accepts either a "
                 "list or a string containing a file name"))
 
-        prime_node = PrimeNode(config_list,
-                               self.process_registry,
-                               self.sampling_process,
-                               self.comment_token,
-                               self.separator_token,
-                               self.process_opt_start_token,
-                               self.process_opt_end_token,
-                               self.process_opt_separator,
-                               self.sampling_token)
-        self.nodes = prime_node.distill()
+        if nodes is None:
+            prime_node = PrimeNode(config_list,
+                                   self._registry_tuple,
+                                   self.sampling_process,
+                                   self.comment_token,
+                                   self.separator_token,
+                                   self.process_opt_start_token,
+                                   self.process_opt_end_token,
+                                   self.process_opt_separator,
+                                   self.sampling_token)
+            nodes = prime_node.distill()
+
+            if use_cache and isinstance(config, str):
+                self._store_cached_nodes(config, cache_key, nodes)
+
+        self.nodes = nodes
+        self._flat_nodes = self._flatten_nodes()
+        for node in self._flat_nodes:
+            node.fuse_kernels()
+        self._fused_chain = fuse_chain(self._flat_nodes)
 
         self.reset_distillery()
 
+    def _read_config_file(self, file_name):
+        """Reads the lines of a configuration file that are not comments.
+
+        The file is read in binary mode so that empty lines and comment
+        lines are discarded before being decoded (UTF-8).
+
+        Args:
+            file_name(str): Configuration file name.
+
+        Returns:
+            A list with the configuration lines (str).
+        """
+        comment_token = self.comment_token.encode("utf-8")
+        config_list = []
+        with open(file_name, "rb") as file:
+            for raw_line in file:
+                raw_line = raw_line.strip()
+                if not raw_line or raw_line.startswith(comment_token):
+                    continue
+                config_list.append(raw_line.decode("utf-8"))
+        return config_list
+
+    def _freeze_registry(self):
+        """Makes the process registry read-only.
+
+        Besides the read-only 'process_registry' mapping this also
+        builds '_registry_tuple', which maps each process name to a
+        tuple of the process object and a flag that indicates wheter
+        the process is configurable (has a 'config_process' method).
+        """
+        if isinstance(self.process_registry, MappingProxyType):
+            return
+
+        self._registry_tuple = {
+            name: (process, hasattr(process, "config_process"))
+            for name, process in self.process_registry.items()}
+        self.process_registry = MappingProxyType(self.process_registry)
+
+    def _cache_key(self, file_name):
+        """Hashes everything that determines the result of a config file.
+
+        Args:
+            file_name(str): Configuration file name.
+
+        Returns:
+            A str digest of the file path, size and modification time,
+            the registered process names and the configuration tokens.
+        """
+        file_stat = os.stat(file_name)
+        key_items = [os.path.abspath(file_name),
+                     file_stat.st_size,
+                     file_stat.st_mtime_ns,
+                     sorted(self.process_registry),
+                     self.comment_token,
+                     self.separator_token,
+                     self.process_opt_start_token,
+                     self.process_opt_end_token,
+                     self.process_opt_separator,
+                     self.sampling_token]
+        return hashlib.blake2b(repr(key_items).encode()).hexdigest()
+
+    def _load_cached_nodes(self, file_name, cache_key):
+        """Loads the nodes stored in the cache file of 'file_name'.
+
+        Args:
+            file_name(str): Configuration file name.
+            cache_key(str): Expected key of the cache file.
+
+        Returns:
+            The list of cached DistillerNodes, bound to the currently
+            registered sampling process, or 'None' if the cache file
+            does not exist, is outdated or can not be loaded.
+        """
+        try:
+            with open(file_name + _CACHE_SUFFIX, "rb") as cache_file:
+                stored_key, nodes = _NodeUnpickler(cache_file, self).load()
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+        if stored_key != cache_key:
+            return None
+
+        # The cache may have been written with another (or no) sampling
+        # process, the sampling state of each node is derived from it.
+        for node in nodes:
+            node.add_sampling_process(self.sampling_process)
+        return nodes
+
+    def _store_cached_nodes(self, file_name, cache_key, nodes):
+        """Stores 'nodes' in the cache file of 'file_name'.
+
+        Nodes that can not be pickled (e.g. a process holding an open
+        file) are simply not cached.
+
+        Args:
+            file_name(str): Configuration file name.
+            cache_key(str): Key of the cache file.
+            nodes(:obj:`list` of :obj: 'DistillerNode'): Nodes to cache.
+        """
+        cache_name = file_name + _CACHE_SUFFIX
+        temp_name = cache_name + ".tmp"
+        try:
+            with open(temp_name, "wb") as cache_file:
+                _NodePickler(cache_file, self).dump((cache_key, nodes))
+            os.replace(temp_name, cache_name)
+        except Exception:  # pylint: disable=broad-except
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+
+    def _flatten_nodes(self):
+        """Walks the node chain once and returns it as a flat list."""
+        flat_nodes = []
+        node = self.nodes[0] if self.nodes else None
+        while node is not None:
+            flat_nodes.append(node)
+            node = node.next_node
+        return flat_nodes
+
     def reset_distillery(self):
         """Resets the Distillery object state.
 
@@ -257,7 +524,14 @@ class Distillery:
         """
         results = None
         if self.nodes and self.next:
-            results = self.nodes[0].distill_node(input_obj)
+            if self._fused_chain is not None:
+                results = self._fused_chain(input_obj)
+            else:
+                results = input_obj
+                for node in self._flat_nodes:
+                    results = node._distill_local(results)
+                    if results is None:
+                        break
             if results is None:
                 self.next = False
             else:
@@ -269,9 +543,195 @@ class Distillery:
                     self.sampling_process.stop_sampling_process()
         return results # Este método deveria retornar self.next?
 
+    def close(self):
+        """Signals to the sampling process that the processing is over.
+
+        Calls the sampling process 'close' method, if it has one, so
+        that it can release its resources (files, connections, ...).
+        """
+        close = getattr(self.sampling_process, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def stream(self, inputs):
+        """Processes every input object and yields the results in order.
+
+        Each node runs in its own thread, so while a node processes an
+        input the previous node can already process the next one. This
+        only pays off when processes release the GIL (e.g. NumPy or
+        numba based processes) and inputs are independent of each
+        other.
+
+        The inputs are processed serially, exactly like successive
+        'distill' calls, if the structure has a single node, if a
+        sampling process is registered (samples would not be stored in
+        order) or if the same process object is used by more than one
+        node (it would be called from two threads at once).
+
+        Args:
+            inputs(iterable): Objects compatible with the registered
+                data processing objects.
+
+        Yields:
+            The output of the last processed node for every input, the
+            stream ends after the first 'None' output (see 'distill').
+            Inputs already being processed when 'None' is returned are
+            discarded.
+        """
+        if not self._pipeline_safe():
+            for input_obj in inputs:
+                if not (self.nodes and self.next):
+                    return
+                yield self.distill(input_obj)
+            return
+
+        if not self.next:
+            return
+
+        queues = [queue.Queue(_STREAM_QUEUE_SIZE)
+                  for _ in range(len(self._flat_nodes) + 1)]
+        stop_event = threading.Event()
+
+        threads = [threading.Thread(target=_feed_stream,
+                                    args=(inputs, queues[0], stop_event),
+                                    daemon=True)]
+        for index, node in enumerate(self._flat_nodes):
+            threads.append(threading.Thread(target=_run_stream_node,
+                                            args=(node,
+                                                  queues[index],
+                                                  queues[index + 1],
+                                                  stop_event),
+                                            daemon=True))
+        for thread in threads:
+            thread.start()
+
+        output_queue = queues[-1]
+        result = None
+        try:
+            result = output_queue.get()
+            while result is not _STREAM_END:
+                if isinstance(result, _StreamError):
+                    raise result.exception
+                elif result is None:
+                    self.next = False
+                    yield None
+                    break
+
+                yield result
+                result = output_queue.get()
+        finally:
+            stop_event.set()
+            while result is not _STREAM_END:
+                result = output_queue.get()
+
+    def _pipeline_safe(self):
+        """Indicates wheter 'stream' may run each node in its own thread."""
+        if len(self._flat_nodes) < 2 or self.sampling_process:
+            return False
+
+        process_ids = [id(process) for node in self._flat_nodes
+                       for process, *_ in node.node_process_list]
+        return len(process_ids) == len(set(process_ids))
+
+
+class _StreamError:
+    """Carries an exception raised inside 'Distillery.stream' threads."""
+    def __init__(self, exception):
+        self.exception = exception
+
+
+def _feed_stream(inputs, output_queue, stop_event):
+    """Puts every input object in the queue of the first stream node."""
+    try:
+        for input_obj in inputs:
+            if stop_event.is_set():
+                break
+            output_queue.put(input_obj)
+    except Exception as exception:  # pylint: disable=broad-except
+        output_queue.put(_StreamError(exception))
+    output_queue.put(_STREAM_END)
+
+
+def _run_stream_node(node, input_queue, output_queue, stop_event):
+    """Processes the inputs of a single stream node until the end mark.
+
+    'None' outputs and errors are passed on untouched so that they
+    reach the consumer, after a stop is signaled the remaining inputs
+    are discarded (passed on as 'None').
+    """
+    while True:
+        item = input_queue.get()
+        if not (item is _STREAM_END or item is None or
+                isinstance(item, _StreamError)):
+            if stop_event.is_set():
+                item = None
+            else:
+                try:
+                    item = node._distill_local(item)
+                except Exception as exception:  # pylint: disable=broad-except
+                    item = _StreamError(exception)
+        output_queue.put(item)
+        if item is _STREAM_END:
+            return
+
+
+class _NodePickler(pickle.Pickler):
+    """Pickler that stores references to a Distillery's own objects.
+
+    Registered processes and the sampling process are stored by
+    reference, so that cached nodes are bound to the objects currently
+    registered in the Distillery instead of copies of them.
+    """
+    def __init__(self, file, distillery):
+        super().__init__(file)
+        self.sampling_process = distillery.sampling_process
+        self.process_names = {id(process): name for name, process
+                              in distillery.process_registry.items()}
+
+    def persistent_id(self, obj):  # pylint: disable=method-hidden
+        if obj is not None and obj is self.sampling_process:
+            return ("sampling_process",)
+        if id(obj) in self.process_names:
+            return ("process", self.process_names[id(obj)])
+        return None
+
+
+class _NodeUnpickler(pickle.Unpickler):
+    """Unpickler for the cache files written by '_NodePickler'."""
+    def __init__(self, file, distillery):
+        super().__init__(file)
+        self.distillery = distillery
+
+    def persistent_load(self, pid):  # pylint: disable=method-hidden
+        if pid[0] == "sampling_process":
+            return self.distillery.sampling_process
+        if pid[0] == "process":
+            return self.distillery.process_registry[pid[1]]
+        raise pickle.UnpicklingError("Unknown persistent id: " + repr(pid))
+
 
 #Incluir isso como método da classe Distillery.
 class PrimeNode:
+    __slots__ = ("nodes",
+                 "cfg_list",
+                 "process_registry",
+                 "sampling_process",
+                 "comment_token",
+                 "separator_token",
+                 "opt_start_token",
+                 "opt_end_token",
+                 "opt_separator",
+                 "sampling_token",
+                 "repeat_exec_token",
+                 "once_exec_token",
+                 "cfg_tokens")
+
     def __init__(self,
                  config_list,
                  process_registry,
@@ -284,9 +744,9 @@ class PrimeNode:
                  sampling_token):
         self.nodes = []
         self.cfg_list = config_list
+        # Maps names to (process, configurable), see Distillery._registry_tuple
         self.process_registry = process_registry
         self.sampling_process = sampling_process
-        self.eof = False
 
         self.comment_token = comment_token
         self.separator_token = separator_token
@@ -297,121 +757,105 @@ class PrimeNode:
         self.repeat_exec_token = "r"
         self.once_exec_token = "o"
 
-    def _node_opt_sanity_check(self, node_opt):
-        repeat_count = node_opt.count(self.repeat_exec_token)
-        once_count = node_opt.count(self.once_exec_token)
-        sample_count = node_opt.count(self.sampling_token)
-
-        node_cfg_ok = True
-        if repeat_count > 1:
-            node_cfg_ok = False
-        if once_count > 1:
-            node_cfg_ok = False
-        if sample_count > 1:
-            node_cfg_ok = False
-        if (repeat_count != 1) and (once_count != 1):
-            node_cfg_ok = False
-
-        return node_cfg_ok
-
-    def _split_proc_cfg(self, proc_cfg):
-        index = 0
-        char = proc_cfg[index]
-        while not char.isupper():
-            index += 1
-            char = proc_cfg[index]
-
-        node_opt = proc_cfg[:index]
-        process = proc_cfg[index:].rstrip() # Removes '\n'
-        return node_opt, process
+        self.cfg_tokens = (self.repeat_exec_token,
+                           self.once_exec_token,
+                           self.sampling_token,
+                           self.opt_start_token,
+                           self.opt_end_token)
 
-    def _read_node_opt(self, node_opt):
-        digit_index = 0
-        char = node_opt[digit_index]
-        while char.isdigit():
-            digit_index += 1
-            char = node_opt[digit_index]
+    def _parse_process(self, proc_cfg):
+        opt_num, limited, sample_flag, proc_name, opt_pairs = \
+            _parse_proc_cfg(proc_cfg, self.cfg_tokens)
 
-        opt_num = 1 # If no number is given then 1 is assumed.
-        if digit_index > 0:
-            opt_num = int(node_opt[0:digit_index])
+        registry_entry = self.process_registry.get(proc_name)
+        if registry_entry is None:
+            raise ValueError("Process (" + proc_cfg + ") not found in registry")
 
-        exec_opt = node_opt[digit_index:]
+        proc, configurable = registry_entry
+        opt_dict = None
+        if configurable:
+            if opt_pairs:
+                opt_dict = dict(opt_pairs)
+        elif opt_pairs is not None:
+            raise ValueError("Process (" + proc_cfg + ") has no options")
 
-        limited = None
-        if self.repeat_exec_token in exec_opt:
-            limited = False
-        elif self.once_exec_token in exec_opt:
-            limited = True
+        return NodeSpec(proc, opt_num, limited, sample_flag, opt_dict)
 
-        sample_flag = False
-        if self.sampling_token in exec_opt:
-            sample_flag = True
+    def parse(self):
+        """Parses the configuration list without creating any node.
 
-        return opt_num, limited, sample_flag
+        Returns:
+            A list with a list of NodeSpec objects for each node.
+        """
+        node_specs = []
+        for raw_line in self.cfg_list:
+            line = raw_line.strip()
+            if not line or line.startswith(self.comment_token):
+                continue
 
-    def _setup_process(self, node, proc_cfg):
-        node_opt, process = self._split_proc_cfg(proc_cfg)
+            node_specs.append([self._parse_process(proc_cfg) for proc_cfg
+                               in line.split(self.separator_token)])
 
-        if not self._node_opt_sanity_check(node_opt):
-            raise ValueError("Invalid node configuration: " + proc_cfg)
+        return node_specs
 
-        opt_num, limited, sample_flag = self._read_node_opt(node_opt)
+    def build(self, node_specs):
+        """Creates the DistillerNodes described by 'node_specs'.
 
-        process_opt = None
+        Args:
+            node_specs: List with a list of NodeSpec objects for each
+                node, as returned by 'parse'.
 
-        if self.opt_start_token in process:
-            temp = process.split(self.opt_start_token, 1)
-            proc_name = temp[0]
-            temp = temp[1].rsplit(self.opt_end_token, 1)
+        Returns:
+            The list of linked DistillerNode objects.
+        """
+        self.nodes = [DistillerNode() for _ in node_specs]
 
-            process_opt = temp[0]
-        else:
-            proc_name = process
+        for node, process_specs in zip(self.nodes, node_specs):
+            for spec in process_specs:
+                proc = spec.process
 
-        proc = self.process_registry.get(proc_name)
-        if proc is not None:
+                if spec.opt_dict is not None:
+                    if hasattr(proc, "clone"):
+                        proc = proc.clone()
+                    else:
+                        proc = cp.deepcopy(proc)
+                    proc.config_process(spec.opt_dict)
 
-            if process_opt:
-                proc1 = cp.deepcopy(proc)
+                node.add_process(proc,
+                                 spec.opt_num,
+                                 spec.limited,
+                                 spec.sample_flag)
 
-                opt_dict = dict()
-                for opt_name, opt_value in opt_generator(process_opt):
-                    opt_dict[opt_name] = opt_value
+            node.add_sampling_process(self.sampling_process)
 
-                proc1.config_process(opt_dict)
-                proc = proc1
+        for prev_node, node in zip(self.nodes, self.nodes[1:]):
+            prev_node.add_node(node)
 
-            node.add_process(proc, opt_num, limited, sample_flag)
-        else:
-            raise ValueError("Process (" + proc_cfg + ") not found in registry")
+        return self.nodes
 
     def distill(self):
-        prev_node = None
-
-        for line in self.cfg_list:
-            if not line.startswith(self.comment_token):
-                processes = line.split(self.separator_token)
-                if processes:
-                    node = DistillerNode()
-                    for proc_cfg in processes:
-                        self._setup_process(node, proc_cfg)
-
-                    node.add_sampling_process(self.sampling_process)
-                    if prev_node:
-                        prev_node.add_node(node)
+        return self.build(self.parse())
 
-                    prev_node = node
-                    self.nodes.append(node)
 
-        return self.nodes
+class PrinterProcess:
+    """Prints to console the data it receives.
 
+    Attributes:
+        help: String that contains a short help text.
+        name: String with the name that identifies this process.
+        _verbose: Flag that indicates wheter data is actually printed,
+            by default only if the standard output is a terminal.
+    """
+    __slots__ = ("help", "name", "_verbose")
 
-class PrinterProcess:
-    def __init__(self):
+    def __init__(self, verbose=None):
         self.help = "Prints extracted data"
         self.name = "dPRINT"
+        if verbose is None:
+            verbose = sys.stdout.isatty()
+        self._verbose = verbose
 
     def distill(self, process_input):
-        print(process_input)
-        return input, None
+        if self._verbose:
+            sys.stdout.write(str(process_input) + "\n")
+        return process_input, None
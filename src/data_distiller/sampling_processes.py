@@ -24,7 +24,13 @@ process the current stage it should executing:
 
 Sampling processes receive 'samples' objects of undefined type and
 thus should be carefully chosen to ensure compatibility with the
-processes that generate them.
+processes that generate them. A sampling process may also contain an
+optional 'store_samples' method, which receives a list with all the
+samples generated by a single 'DistillerNode' call at once, and an
+optional 'close' method, called by 'Distillery.close' once no more data
+will be sampled (e.g. to close files kept open between batches). The
+classes of this module implement 'close' (it is safe to call it more
+than once) and can be used as context managers that call it on exit.
 
     Typical usage example:
 
@@ -36,10 +42,246 @@ processes that generate them.
     # DistillerNode will call the 'store_sample' method.
 """
 
+import atexit
+import contextlib
+import csv
+import os
+import queue
 import sqlite3
+import sys
+import threading
+from itertools import groupby, zip_longest
+from operator import itemgetter
 
 
-class Sample2Text:
+# Size of the user space write buffer of the output files.
+_BUFFER_SIZE = 1 << 20
+
+# Number of entries of the io_uring queues used by '_UringFile'.
+_URING_ENTRIES = 8
+
+# 'liburing' functions and classes used by '_UringFile'.
+_URING_API = ("Ring",
+              "Cqe",
+              "io_uring_queue_init",
+              "io_uring_queue_exit",
+              "io_uring_get_sqe",
+              "io_uring_prep_write",
+              "io_uring_submit",
+              "io_uring_wait_cqe",
+              "io_uring_cqe_seen",
+              "trap_error")
+
+# Default number of rows of each row group written by 'Sample2Parquet'.
+_ROW_GROUP_SIZE = 1 << 16
+
+# Marks a missing value in a Sample2Table column.
+_MISSING = object()
+
+# Text written by Sample2XSV in place of a missing value.
+_XSV_MISSING = "-"
+
+# Line written between the samples of different batches.
+_TEXT_SEPARATOR = "-" * 56
+
+
+def _import_pyarrow():
+    """Returns the 'pyarrow' module, or None if it is not installed.
+
+    pyarrow is slow to import, so it is only imported by the processes
+    that use it ('Sample2Arrow' and 'Sample2Parquet').
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _import_parquet():
+    """Returns the 'pyarrow.parquet' module, or None if not installed."""
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow.parquet
+
+
+def _uring_module():
+    """Returns the 'liburing' module, or None if it can not be used.
+
+    The module is only imported when an io_uring output is requested,
+    releases without the API used by '_UringFile' are ignored.
+    """
+    try:
+        import liburing
+    except ImportError:
+        return None
+
+    if not all(hasattr(liburing, name) for name in _URING_API):
+        return None
+    return liburing
+
+
+class _UringFile:
+    """Write-only text file that writes its data through io_uring.
+
+    Written text is kept in memory until about '_BUFFER_SIZE'
+    characters are buffered, then it is submitted as a single write
+    request without waiting for it, the request is only waited for on
+    the next submission. This lets the kernel write a batch while the
+    next one is being buffered. As with regular files 'flush' (and
+    'close') only returns once all written text reached the file.
+
+    The file is closed at interpreter exit if 'close' is never called.
+
+    Args:
+        file_name: Output file name.
+        append: If True data is appended to the file, otherwise the
+            file is truncated.
+        uring: The 'liburing' module (see '_uring_module').
+    """
+    def __init__(self, file_name, append, uring):
+        flags = os.O_WRONLY | os.O_CREAT
+        flags |= os.O_APPEND if append else os.O_TRUNC
+        self._fd = os.open(file_name, flags, 0o666)
+        self._offset = os.fstat(self._fd).st_size
+        self._parts = []
+        self._size = 0
+        self._pending = None
+        self._pending_offset = 0
+
+        self._uring = uring
+        self._ring = uring.Ring()
+        self._cqe = uring.Cqe()
+        try:
+            uring.trap_error(uring.io_uring_queue_init(_URING_ENTRIES,
+                                                       self._ring))
+        except Exception:
+            os.close(self._fd)
+            raise
+        atexit.register(self.close)
+
+    def write(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= _BUFFER_SIZE:
+            self._submit()
+        return len(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def tell(self):
+        """Returns the file position after the already flushed data."""
+        return self._offset
+
+    def flush(self):
+        """Writes the buffered text and waits for it to complete."""
+        self._submit()
+        self._wait()
+
+    def _submit(self):
+        """Submits the buffered text, waits for the previous request."""
+        self._wait()
+        if not self._parts:
+            return
+
+        data = "".join(self._parts).encode("utf-8")
+        self._parts = []
+        self._size = 0
+
+        uring = self._uring
+        sqe = uring.io_uring_get_sqe(self._ring)
+        uring.io_uring_prep_write(sqe, self._fd, data, self._offset)
+        uring.trap_error(uring.io_uring_submit(self._ring))
+
+        self._pending = data  # Must stay alive until the write completes.
+        self._pending_offset = self._offset
+        self._offset += len(data)
+
+    def close(self):
+        if self._fd is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._uring.io_uring_queue_exit(self._ring)
+            os.close(self._fd)
+            self._fd = None
+            atexit.unregister(self.close)
+
+    def _wait(self):
+        """Waits for the pending write request, if any, to complete."""
+        if self._pending is None:
+            return
+
+        uring = self._uring
+        uring.trap_error(uring.io_uring_wait_cqe(self._ring, self._cqe))
+        cqe = self._cqe[0]
+        try:
+            written = uring.trap_error(cqe.res)
+        finally:
+            uring.io_uring_cqe_seen(self._ring, cqe)
+
+        while written < len(self._pending):  # Completes short writes.
+            written += os.pwrite(self._fd,
+                                 self._pending[written:],
+                                 self._pending_offset + written)
+        self._pending = None
+
+
+def _open_output(file_name, append, use_uring, newline=None):
+    """Opens a buffered text output file.
+
+    Args:
+        file_name: Output file name.
+        append: If True data is appended to the file, otherwise the
+            file is truncated.
+        use_uring: Use a '_UringFile' if possible (Linux and a usable
+            'liburing' package is installed).
+        newline: Same as the 'open' built-in 'newline' argument, not
+            used by '_UringFile' (which never translates newlines).
+
+    Returns:
+        A file object.
+    """
+    uring = None
+    if use_uring and sys.platform == "linux":
+        uring = _uring_module()
+
+    if uring is not None:
+        try:
+            return _UringFile(file_name, append, uring)
+        except Exception:
+            pass  # e.g. kernel without io_uring support, use a plain file.
+
+    return open(file_name, "a" if append else "w", newline=newline,
+                buffering=_BUFFER_SIZE)
+
+
+def _quote_identifier(identifier):
+    """Quotes a table or column name to be used in a SQLite statement."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class _SamplingProcess(contextlib.AbstractContextManager):
+    """Base of the sampling processes, closes them on context exit."""
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Releases the resources of the sampling process.
+
+        Nothing is kept open between batches, so nothing is released.
+        """
+        pass
+
+
+class Sample2Text(_SamplingProcess):
     """Class that stores data in a text file.
 
     A Sample2Text object is sampling process compatible with the
@@ -61,16 +303,23 @@ class Sample2Text:
         last_distill_count: Auxiliary variable used to detect that a
             the sampling process is now sampling another distill
             batch from a 'Distillery' object.
+        use_uring: Flag that indicates wheter the output file should be
+            written through io_uring (Linux only, requires the
+            'liburing' package, otherwise it is ignored).
     """
-    def __init__(self, file_name, write_count=True):
+    def __init__(self, file_name, write_count=True, use_uring=False):
         self.help = "Prints sample data to text file"
         self.name = "Sample2Text"
         self.file_name = file_name
         self.text_file = None
         self.write_count = write_count
+        self.use_uring = use_uring
         self.sample_count = 0
         self.distill_count = 0
         self.last_distill_count = 0
+        self._formatters = {str: self._format_str,
+                            list: self._format_list,
+                            dict: self._format_dict}
 
     def start_sampling_process(self):
         """Initial configuration of the sampling process.
@@ -78,7 +327,7 @@ class Sample2Text:
         This method simply sets the output file handle, the file is
         opened so that data is appended to it.
         """
-        self.text_file = open(self.file_name, "w+")
+        self.text_file = _open_output(self.file_name, False, self.use_uring)
 
     def continue_sampling_process(self):
         """Signals a 'pause' to the sampling process.
@@ -97,7 +346,13 @@ class Sample2Text:
 
         This method simply closes the output file handle.
         """
-        self.text_file.close()
+        self.close()
+
+    def close(self):
+        """Closes the output file, if it is open."""
+        if self.text_file is not None:
+            self.text_file.close()
+            self.text_file = None
 
     def store_sample(self, samples):
         """Receives samples and stores them to the output text file.
@@ -116,34 +371,43 @@ class Sample2Text:
         """
         if self.text_file and samples:
 
+            parts = []
             if self.last_distill_count == self.distill_count:
                 self.distill_count += 1
                 if self.write_count:
-                    self.text_file.write("Registro " + str(self.distill_count) +
-                                         " (" + str(self.sample_count) +
-                                         " amostras acumuladas)\n")
-                    self.text_file.write("--------------------------------------------------------\n")
+                    parts.append(f"Registro {self.distill_count} "
+                                 f"({self.sample_count} amostras acumuladas)\n"
+                                 f"{_TEXT_SEPARATOR}\n")
 
             self.sample_count += 1
-            if isinstance(samples, str):
-                self.text_file.write(samples)
-            elif isinstance(samples, list):
-                for i in samples:
-                    self.text_file.write(i)
-                    self.text_file.write("\t")
-            elif isinstance(samples, dict):
-                for key, value in samples.items():
-                    self.text_file.write(key)
-                    self.text_file.write(": ")
-                    self.text_file.write(value)
-                    self.text_file.write("\t")
-            else:
-                self.text_file.write(samples)
-
-            self.text_file.write("\n")
-
-
-class Sample2ObjectList:
+            formatter = self._formatters.get(type(samples), self._format_other)
+            parts.append(formatter(samples))
+
+            parts.append("\n")
+            self.text_file.write("".join(parts))
+
+    def _format_str(self, samples):
+        return samples
+
+    def _format_list(self, samples):
+        return "\t".join(samples) + "\t"
+
+    def _format_dict(self, samples):
+        return "\t".join(key + ": " + value
+                         for key, value in samples.items()) + "\t"
+
+    def _format_other(self, samples):
+        """Formats objects whose exact type has no entry in '_formatters'."""
+        if isinstance(samples, str):
+            return self._format_str(samples)
+        elif isinstance(samples, list):
+            return self._format_list(samples)
+        elif isinstance(samples, dict):
+            return self._format_dict(samples)
+        return samples
+
+
+class Sample2ObjectList(_SamplingProcess):
     """Class that stores data into an list of objects.
 
     A Sample2ObjectList object is sampling process compatible with the
@@ -197,13 +461,22 @@ class Sample2ObjectList:
         if samples:
             self.object_list.append(samples)
 
+    def store_samples(self, samples_list):
+        """Receives a list of samples and stores them in the object_list.
+
+        Args:
+            samples_list: List of objects containing the samples.
+        """
+        self.object_list.extend(samples for samples in samples_list
+                                if samples)
+
     def get_list(self):
         return self.object_list
 
     def clear_list(self):
         self.object_list.clear()
 
-class Sample2Table:
+class Sample2Table(_SamplingProcess):
     """Class that stores data in table format without persistance.
 
     A Sample2Table object is sampling process compatible with the
@@ -211,6 +484,11 @@ class Sample2Table:
     compatible with samples as dictionary objects. Data is stored
     as a dictionary of 'names-to-lists'.
 
+    Every column list holds one value per row (batch), rows in which
+    a column was not sampled hold the '_MISSING' sentinel. Columns
+    are only padded when they are sampled, so a column may be shorter
+    than the table, its missing trailing values are implicit.
+
     As an option this class can treat repeated column names by
     appending a number after each repeated name, this only works
     if the repeated columns are always presented in the same order
@@ -219,12 +497,13 @@ class Sample2Table:
     Attributes:
         help: String that contains a short help text.
         name: String with the name that identifies this process.
-        table: Dictionary containing the data in 'table' format.
+        table: Dictionary mapping each column name to the list of its
+            sampled values, indexed by batch number (row).
         current_index: Indicates current batch number.
         previous_index: Auxiliary variable used to determine if
             the current sample is the first one of a batch.
-        sampled_names: Set object that stores columns (keys) have
-            already been sampled in this batch.
+        _name_counts: Dictionary that stores how many times each column
+            (key) has already been sampled in this batch.
         fix_repeated_names: Flag that indicates wheter the sampling
             process should attempt to fix/replace repeated column
             names.
@@ -235,14 +514,11 @@ class Sample2Table:
         self.table = dict()
         self.current_index = 0
         self.previous_index = None
-        self.sampled_names = set()
+        self._name_counts = dict()
         self.fix_repeated_names = fix_repeated_names
 
     def start_sampling_process(self):
-        self.table.clear()
-        self.current_index = 0
-        self.previous_index = None
-        self.sampled_names.clear()
+        self._clear_table()
 
     def continue_sampling_process(self):
         self.previous_index = self.current_index
@@ -250,162 +526,446 @@ class Sample2Table:
     def stop_sampling_process(self):
         pass
 
+    def _clear_table(self):
+        """Removes all rows, the next sample starts a new table."""
+        self.table.clear()
+        self.current_index = 0
+        self.previous_index = None
+        self._name_counts.clear()
+
     def store_sample(self, samples):
         if samples and isinstance(samples, dict):
 
             if self.previous_index == self.current_index:
                 self.current_index += 1
-                self.sampled_names.clear()
+                self._name_counts.clear()
 
+            fix = self.fix_repeated_names
+            intern = sys.intern
+            table = self.table
+            fixed_name = self._fixed_name
+            row = self.current_index
             for key, value in samples.items():
-                if key in self.table:
-                    self._append_sample(key, value)
-                else:
-                    self.table[key] = [(self.current_index, value)]
-                    self.sampled_names.add(key)
+                if type(key) is str:
+                    key = intern(key)  # Column names repeat every batch.
+                if fix:
+                    key = fixed_name(key)
+
+                column = table.get(key)
+                if column is None:
+                    column = table[key] = []
+
+                # A column with a value in this row keeps its first value.
+                padding = row - len(column)
+                if padding >= 0:
+                    if padding:
+                        column.extend([_MISSING] * padding)
+                    column.append(value)
         else:
             if not isinstance(samples, dict):
                 raise ValueError(self.name + " process accepts only dictionaries as samples")
 
-    def _append_sample(self, key, value):
-        temp_key = key
-        if self.fix_repeated_names and temp_key in self.sampled_names:
-            fix_count = 1
-            temp_key = key + "-" + str(fix_count)
+    def _fixed_name(self, key):
+        """Returns the column name of the next value of 'key' in this batch.
+
+        The n-th repetition of 'key' in a batch is named 'key-n'.
+        """
+        name_count = self._name_counts.get(key, 0)
+        self._name_counts[key] = name_count + 1
+        if name_count:
+            return f"{key}-{name_count}"
+        return key
+
+    def _row_count(self):
+        """Returns the number of rows (batches) with sampled data."""
+        if not self.table:
+            return 0
+        return self.current_index + 1
+
+    def _rows(self):
+        """Yields the values of each row, in the same order as 'table'.
+
+        Missing values are returned as '_MISSING'.
+        """
+        return zip_longest(*self.table.values(), fillvalue=_MISSING)
+
+    def _columns(self, missing=None):
+        """Returns a dictionary mapping each column name to its values.
+
+        Every column has one value per row, missing values are
+        replaced by 'missing'.
+        """
+        row_count = self._row_count()
+        columns = dict()
+        for key, values in self.table.items():
+            column = [missing if value is _MISSING else value
+                      for value in values]
+            column.extend([missing] * (row_count - len(column)))
+            columns[key] = column
+        return columns
+
+
+class Sample2Arrow(Sample2Table):
+    """Class that stores data in an Arrow IPC file.
+
+    The rows sampled between 'start_sampling_process' and
+    'stop_sampling_process' are converted to Arrow columns (one typed
+    buffer per column, missing values are null) and written to the
+    output file as a record batch. The schema of the file is taken
+    from the first written batch, later batches are cast to it.
+    Requires the 'pyarrow' package.
+
+    The file is finished (and closed) by 'stop_sampling_process', so
+    it is complete once a Distillery has no more data to process, a
+    later run (after 'Distillery.reset_distillery') writes a new file.
+
+    Attributes:
+        file_name: Output file name.
+        schema: Schema of the output file, None until the first batch
+            of a run is written.
+    """
+    def __init__(self, file_name, fix_repeated_names=False):
+        if _import_pyarrow() is None:
+            raise ValueError("Sample2Arrow process requires the pyarrow package")
 
-            # Check if temp_key already was sampled and propose a new name
-            while temp_key in self.sampled_names:
-                temp_key = key + "-" + str(fix_count)
-                fix_count += 1
+        super().__init__(fix_repeated_names)
+        self.help = "Stores data in an Arrow IPC file"
+        self.name = "Sample2Arrow"
+        self.file_name = file_name
+        self.schema = None
+        self._writer = None
 
-            if temp_key not in self.table:
-                self.table[temp_key] = []  # Initializes with fixed name.
+    def start_sampling_process(self):
+        super().start_sampling_process()
+        if self._writer is None:
+            self.schema = None  # A new file takes the schema of its data.
 
-        indexed_list = self.table[temp_key]
-        indexed_list.append((self.current_index, value))
-        self.sampled_names.add(temp_key)
+    def stop_sampling_process(self):
+        """Writes the remaining rows and finishes the output file."""
+        self._write_table()
+        self.close()
+
+    def close(self):
+        """Finishes and closes the output file, if it is open."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _write_table(self):
+        """Writes the sampled rows, the output file is opened if needed."""
+        if not self.table:
+            return
+
+        record_batch = self._record_batch()
+        if self._writer is None:
+            self.schema = record_batch.schema
+            self._writer = self._open_writer()
+        self._write_batch(record_batch)
+
+    def _open_writer(self):
+        return _import_pyarrow().ipc.new_file(self.file_name, self.schema)
+
+    def _write_batch(self, record_batch):
+        self._writer.write_batch(record_batch)
+
+    def _record_batch(self):
+        pyarrow = _import_pyarrow()
+        columns = self._columns()
+        if self.schema is None:
+            return pyarrow.record_batch([pyarrow.array(column)
+                                         for column in columns.values()],
+                                        names=list(columns))
+
+        new_columns = [key for key in columns if key not in self.schema.names]
+        if new_columns:
+            raise ValueError(self.name + " got columns not in the file schema: "
+                             + ", ".join(new_columns))
+
+        row_count = self._row_count()
+        arrays = [pyarrow.array(columns.get(field.name, [None] * row_count),
+                                type=field.type)
+                  for field in self.schema]
+        return pyarrow.record_batch(arrays, schema=self.schema)
+
+
+class Sample2Parquet(Sample2Arrow):
+    """Class that stores data in a Parquet file.
+
+    Sampled rows are buffered and written as a row group (dictionary
+    encoded) every time 'row_group_size' rows are reached, the
+    remaining rows are written and the writer is closed (the file
+    footer is written) by 'stop_sampling_process'. As in
+    'Sample2Arrow' the file schema is taken from the first row group
+    and a later run writes a new file. Requires the 'pyarrow' package
+    (with Parquet support).
+
+    Attributes:
+        file_name: Output file name.
+        schema: Schema of the output file, None until the first row
+            group is written.
+        row_group_size: Number of rows of each row group.
+        compression: Compression codec name (see 'ParquetWriter').
+    """
+    def __init__(self,
+                 file_name,
+                 fix_repeated_names=False,
+                 row_group_size=_ROW_GROUP_SIZE,
+                 compression="snappy"):
+        if _import_parquet() is None:
+            raise ValueError("Sample2Parquet process requires the pyarrow package")
+
+        super().__init__(file_name, fix_repeated_names)
+        self.help = "Stores data in a Parquet file"
+        self.name = "Sample2Parquet"
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+    def continue_sampling_process(self):
+        super().continue_sampling_process()
+        if self._row_count() >= self.row_group_size:
+            self._write_table()
+            self._clear_table()
+
+    def _open_writer(self):
+        return _import_parquet().ParquetWriter(self.file_name,
+                                               self.schema,
+                                               compression=self.compression,
+                                               use_dictionary=True)
+
+    def _write_batch(self, record_batch):
+        table = _import_pyarrow().Table.from_batches([record_batch])
+        self._writer.write_table(table)
 
 
 class Sample2XSV(Sample2Table):
-    def __init__(self, file_name, data_separator, fix_repeated_names=False):
+    def __init__(self,
+                 file_name,
+                 data_separator,
+                 fix_repeated_names=False,
+                 use_uring=False):
         super().__init__(fix_repeated_names)
         self.help = "Prints data in \"X\" separated value text file"
         self.name = "Sample2XSV"
         self.file_name = file_name
         self.text_file = None
         self.data_separator = data_separator
+        self.use_uring = use_uring
         self.header_already_written = False
 
+    def start_sampling_process(self):
+        """Initial configuration of the sampling process.
+
+        The output file is opened only once (data is appended to it),
+        a header is only written if the file was empty.
+        """
+        super().start_sampling_process()
+        if self.text_file is None:
+            self.text_file = _open_output(self.file_name, True,
+                                          self.use_uring, newline="")
+            self.header_already_written = self.text_file.tell() > 0
+
     def stop_sampling_process(self):
-        self.text_file = open(self.file_name, "a")
+        """Writes all sampled rows to the output file.
+
+        Single character separators are written with 'csv.writer'
+        (values are quoted/escaped as needed), for longer separators
+        every value is followed by the separator.
+        """
+        if len(self.data_separator) == 1:
+            self._write_csv()
+        else:
+            self._write_joined()
+
+        self.text_file.flush()
+
+    def _write_csv(self):
+        writer = csv.writer(self.text_file,
+                            delimiter=self.data_separator,
+                            lineterminator="\n")
 
         if not self.header_already_written:
-            header = self._create_header()
-            self.text_file.write(header + "\n")
+            writer.writerow(self.table)
             self.header_already_written = True
 
-        for i in range(0, self.current_index):
-            table_line = ""
-            for key, indexed_list in self.table.items():
-                del key
-                index, data = indexed_list[0]
+        writer.writerows([_XSV_MISSING if data is _MISSING else data
+                          for data in row] for row in self._rows())
 
-                if index == i:
-                    table_line += str(data) + self.data_separator
-                else:
-                    table_line += "-" + self.data_separator
-                indexed_list.pop(0)
+    def _write_joined(self):
+        if not self.header_already_written:
+            header = self._create_header()
+            self.text_file.write(header + "\n")
+            self.header_already_written = True
 
-            self.text_file.write(table_line + "\n")
+        separator = self.data_separator
+        self.text_file.writelines("".join((_XSV_MISSING if data is _MISSING
+                                           else str(data)) + separator
+                                          for data in row) + "\n"
+                                  for row in self._rows())
 
-        self.text_file.close()
+    def close(self):
+        """Closes the output file, called when no more data will be sampled."""
+        if self.text_file is not None:
+            self.text_file.close()
+            self.text_file = None
 
     def _create_header(self):
-        header = ""
-        for key in self.table:
-            if header:
-                header += "\t" + key
-            else:
-                header = key
-        return header
+        return "\t".join(self.table)
 
 
 class Sample2SQLite(Sample2Table):
+    """Class that stores data in a table of a SQLite database.
+
+    Rows are written by a background thread, 'stop_sampling_process'
+    only hands the sampled rows over to it so that a new batch can be
+    processed right away. The database connection is opened by
+    'start_sampling_process' (so connection errors are raised there)
+    and then used only by the writer thread.
+
+    Written rows are only guaranteed to be readable from the database
+    after 'close' (or 'Distillery.close') is called, it waits for all
+    pending rows to be written. An exception raised by the writer
+    thread (e.g. a 'sqlite3.OperationalError' for a column missing
+    from an existing table) is raised again by the next
+    'stop_sampling_process' or 'close' call, the failed batch is
+    rolled back and later batches are discarded.
+    """
     def __init__(self, db_name, table_name, fix_repeated_names=False):
         super().__init__(fix_repeated_names)
         self.db_name = db_name
         self.table_name = table_name
-        self.connection = None
+        self._insert_queries = dict()
+        self._batch_queue = None
+        self._writer = None
+        self._writer_error = None
 
     def start_sampling_process(self):
         super().start_sampling_process()
-        self.connection = sqlite3.connect(self.db_name)
-        if not self.connection:
-            raise ValueError(self.db_name + " connection failed")
-        # self.connection.set_trace_callback(print)
+        if self._writer is None:
+            connection = sqlite3.connect(self.db_name,
+                                         check_same_thread=False)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            except Exception:
+                connection.close()
+                raise
+            # connection.set_trace_callback(print)
+
+            self._batch_queue = queue.Queue()
+            self._writer = threading.Thread(target=self._writer_loop,
+                                            args=(connection,
+                                                  self._batch_queue),
+                                            daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
 
     def continue_sampling_process(self):
         self.previous_index = self.current_index
 
     def stop_sampling_process(self):
+        self._raise_writer_error()
+
+        column_names = list(self.table)
+        signed_rows = list(self._signed_rows(column_names))
+        if signed_rows:
+            self._batch_queue.put((column_names, signed_rows))
+
+    def close(self):
+        """Waits for all pending rows to be written and stops the writer."""
+        if self._writer is not None:
+            self._batch_queue.put(None)
+            self._writer.join()
+            self._writer = None
+            self._batch_queue = None
+            atexit.unregister(self.close)
+
+        error = self._writer_error
+        self._writer_error = None
+        if error is not None:
+            raise error
+
+    def _raise_writer_error(self):
+        if self._writer_error is not None:
+            raise self._writer_error
+
+    def _writer_loop(self, connection, batch_queue):
+        """Writes the batches of rows received until 'None' is received.
+
+        If writing fails the exception is stored in '_writer_error' and
+        the remaining batches are discarded.
+        """
         try:
-            with self.connection:
-                self._create_table(self.table_name)
-                self._insert_data(self.table_name,
-                                  self.table,
-                                  self.current_index)
-
-        except sqlite3.OperationalError as exception:
-            print("OperationalError")
-            print(exception)
-        except sqlite3.IntegrityError as exception:
-            print("IntegrityError")
-            print(exception)
-        except sqlite3.ProgrammingError as exception:
-            print("ProgrammingError")
-            print(exception)
+            batch = batch_queue.get()
+            while batch is not None:
+                if self._writer_error is None:
+                    column_names, signed_rows = batch
+                    try:
+                        self._write_batch(connection, column_names,
+                                          signed_rows)
+                    except Exception as exception:
+                        self._writer_error = exception
+                batch = batch_queue.get()
         finally:
-            self.connection.close()
-
-    def _create_table(self, table_name):
-        if not self._table_exists():
-            column_names = "','".join(self.table.keys())
-            query = "CREATE TABLE '{}' ('{}')".format(table_name, column_names)
+            connection.close()
+
+    def _write_batch(self, connection, column_names, signed_rows):
+        """Writes a batch in a single transaction, rolled back on errors."""
+        with connection:
+            self._create_table(connection, self.table_name, column_names)
+            self._insert_data(connection, self.table_name, signed_rows)
+
+    def _create_table(self, connection, table_name, column_names):
+        if not self._table_exists(connection):
+            column_names = ",".join(map(_quote_identifier, column_names))
+            query = "CREATE TABLE {} ({})".format(_quote_identifier(table_name),
+                                                  column_names)
             # print(query)
-            self.connection.execute(query)
+            connection.execute(query)
 
-    def _table_exists(self):
-        cursor = self.connection.cursor()
+    def _table_exists(self, connection):
+        cursor = connection.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=:t_name", {"t_name": self.table_name})
         table_exists = bool(cursor.fetchone())
         return table_exists
 
-    def _insert_data(self, table_name, data_dict, index_count):
-        self.connection.execute("BEGIN")
-        for i in range(0, index_count):
+    def _insert_data(self, connection, table_name, signed_rows):
+        """Inserts every row of 'signed_rows' into table 'table_name'.
+
+        Consecutive rows with values for the same columns are inserted
+        with a single 'executemany' call, row order is preserved.
+        """
+        connection.execute("BEGIN")
+        for key_list, row_group in groupby(signed_rows, key=itemgetter(0)):
+            query = self._insert_query(table_name, key_list)
+            # print(query)
+            connection.executemany(query, (value_list for _, value_list
+                                           in row_group))
+        connection.execute("COMMIT")
+
+    def _insert_query(self, table_name, key_list):
+        """Returns the (cached) INSERT statement for a set of columns."""
+        query = self._insert_queries.get((table_name, key_list))
+        if query is None:
+            placeholder = ",".join(["?"] * len(key_list))  # ?,?,?, ... ,?
+            columns = ",".join(map(_quote_identifier, key_list))
+            query = "INSERT INTO {} ({}) VALUES ({})".format(
+                _quote_identifier(table_name), columns, placeholder)
+            self._insert_queries[(table_name, key_list)] = query
+        return query
+
+    def _signed_rows(self, keys):
+        """Yields the columns with values and the values of each row.
+
+        Args:
+            keys: List of column names, in the same order as 'table'.
+        """
+        for row in self._rows():
             key_list = []
             value_list = []
 
-            for key, indexed_list in data_dict.items():
-                index, data = indexed_list[0]
-                if index == i:
+            for key, data in zip(keys, row):
+                if data is not _MISSING:
                     key_list.append(key)
                     value_list.append(data)
 
-                indexed_list.pop(0)
-
-            placeholder = "?"
-            placeholder_num = len(value_list)
-            placeholder += ",?" * (placeholder_num-1)  # ?,?,?,?, ... ,?
-
-            columns = "','".join(key_list)
-
-            if not columns:
-                print(data_dict)
-
-            query = "INSERT INTO '{}' ('{}') VALUES ({})".format(table_name,
-                                                                 columns,
-                                                                 placeholder)
-            # print(query)
-            self.connection.execute(query, value_list)
-        self.connection.execute("COMMIT")
+            yield tuple(key_list), value_list
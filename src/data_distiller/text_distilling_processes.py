@@ -143,6 +143,10 @@ class ReadLine:
 
         self.usage = self._opt_mngr.usage()
 
+    def clone(self):
+        """Returns a new, equally configured, ReadLine object."""
+        return type(self)(self.sample_name, self.strip_new_line_only)
+
     def config_process(self, opt_dict):
         """Configures the 'sample_name' and sample format.
 
@@ -249,6 +253,10 @@ class SkipUntilToken:
         self._opt_mngr = OptManager()
         self._opt_mngr.register_opt(self._TOKEN, OptType.STRING, True)
 
+    def clone(self):
+        """Returns a new, equally configured, SkipUntilToken object."""
+        return type(self)(self.token)
+
     def config_process(self, opt_dict):
         """Configures the skip until 'token'.
 